@@ -5,9 +5,12 @@ What it does
 ------------
 1) Uploads a PDF to s3://{S3_BUCKET}/{POLICY_PDF_PREFIX}<filename>.
 2) Your Lambda pipeline (S3 event -> Ingest Lambda -> Textract -> SNS -> Callback Lambda)
-   persists a manifest at {POLICY_OUTPUT_PREFIX}/<timestamp>/<job_id>/index.json
-   plus per-page Textract responses under /pages/page_*.json.
-3) This app polls for that manifest (matching 'source_key') and renders:
+   persists a manifest at {POLICY_OUTPUT_PREFIX}/<yyyymmdd>/<timestamp>/<job_id>/index.json
+   plus all Textract responses in /blocks.ndjson.gz (one gzipped JSON line per page;
+   older runs wrote one object per page under /pages/page_*.json).
+   The callback also writes {POLICY_OUTPUT_PREFIX}/by-source/<sha1(source_key)>.json,
+   a small pointer holding the manifest key.
+3) This app polls that pointer (with exponential backoff) and renders:
    - Combined text (LINE blocks)
    - Key-Value pairs (FORMS)
    - Tables (TABLES), each as a DataFrame with CSV download
@@ -21,24 +24,31 @@ POLICY_OUTPUT_PREFIX=policy/textract-output/
 
 Local run
 ---------
-uv add streamlit boto3 python-dotenv pandas
-uv run streamlit run app_streamlit.py
+uv add streamlit boto3 orjson python-dotenv pandas
+uv run streamlit run app_streamlit.py   # project env: the app imports policy_reviewer_agent
 """
 
 from __future__ import annotations
 
+import gzip
+import hashlib
 import io
-import json
 import os
 import time
-from datetime import datetime, timezone
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
 import boto3
 import botocore
+from botocore.config import Config
+import orjson
 import pandas as pd
 import streamlit as st
 
+from policy_reviewer_agent.services import textract_parser
+
 
 # ---------- Configuration ----------
 
@@ -58,8 +68,15 @@ def get_cfg() -> Dict[str, str]:
     return cfg
 
 
+# One S3 connection pool for every concurrent GET; worker counts below are derived from it.
+S3_MAX_CONNECTIONS = 32
+# Parallel GETs for per-page Textract JSON.
+PAGE_FETCH_WORKERS = 16
+
+
+@st.cache_resource
 def s3_client(region: str):
-    return boto3.client("s3", region_name=region)
+    return boto3.client("s3", region_name=region, config=Config(max_pool_connections=S3_MAX_CONNECTIONS))
 
 
 def bucket_exists(s3, bucket: str) -> bool:
@@ -78,16 +95,24 @@ def upload_pdf_to_s3(s3, bucket: str, key: str, file_bytes: bytes) -> str:
     return f"s3://{bucket}/{key}"
 
 
-def list_recent_objects(s3, bucket: str, prefix: str, max_keys: int = 400) -> List[Dict[str, Any]]:
-    resp = s3.list_objects_v2(Bucket=bucket, Prefix=prefix, MaxKeys=max_keys)
+def list_recent_objects(
+    s3, bucket: str, prefix: str, max_keys: int = 400, start_after: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    kwargs: Dict[str, Any] = {"Bucket": bucket, "Prefix": prefix, "MaxKeys": max_keys}
+    if start_after:
+        kwargs["StartAfter"] = start_after
+    resp = s3.list_objects_v2(**kwargs)
     contents = resp.get("Contents", [])
     contents.sort(key=lambda x: x["LastModified"], reverse=True)
     return contents
 
 
-def get_object_text(s3, bucket: str, key: str) -> str:
-    obj = s3.get_object(Bucket=bucket, Key=key)
-    return obj["Body"].read().decode("utf-8")
+@lru_cache(maxsize=1024)
+def _parse_s3_uri(uri: str) -> Tuple[str, str]:
+    """s3://bucket/key -> (bucket, key)."""
+    _, _, rest = uri.partition("s3://")
+    bkt, _, key = rest.partition("/")
+    return bkt, key
 
 
 def get_object_bytes(s3, bucket: str, key: str) -> bytes:
@@ -95,173 +120,326 @@ def get_object_bytes(s3, bucket: str, key: str) -> bytes:
     return obj["Body"].read()
 
 
+# Objects larger than one part are downloaded as concurrent byte-range GETs.
+RANGE_PART_BYTES = 8 * 1024 * 1024
+RANGE_FETCH_WORKERS = 8
+# Range workers per page when pages are themselves fetched in parallel, so that
+# PAGE_FETCH_WORKERS * this never exceeds the connection pool.
+NESTED_RANGE_FETCH_WORKERS = max(1, S3_MAX_CONNECTIONS // PAGE_FETCH_WORKERS)
+
+
+def get_object_parallel(
+    s3, bucket: str, key: str, part: int = RANGE_PART_BYTES, workers: int = RANGE_FETCH_WORKERS
+) -> bytes:
+    """
+    Download an object, fetching anything larger than `part` as parallel ranged GETs.
+    The first range doubles as the size probe (Content-Range), so objects up to `part`
+    bytes still cost exactly one request and no HEAD is needed. Later ranges are pinned
+    to the first response's ETag, so an overwrite mid-download fails instead of splicing
+    two versions together.
+    """
+    try:
+        first = s3.get_object(Bucket=bucket, Key=key, Range=f"bytes=0-{part - 1}")
+    except botocore.exceptions.ClientError as e:
+        if e.response.get("Error", {}).get("Code") == "InvalidRange":
+            return b""  # zero-length object: no satisfiable range
+        raise
+    head = first["Body"].read()
+    content_range = first.get("ContentRange")
+    total = int(content_range.rpartition("/")[2]) if content_range else len(head)
+    if total <= len(head):
+        return head
+
+    def fetch(rng: Tuple[int, int]) -> bytes:
+        lo, hi = rng
+        return s3.get_object(Bucket=bucket, Key=key, Range=f"bytes={lo}-{hi}", IfMatch=etag)["Body"].read()
+
+    etag = first["ETag"]
+    ranges = [(lo, min(lo + part, total) - 1) for lo in range(len(head), total, part)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return b"".join([head, *pool.map(fetch, ranges)])
+
+
 # ---------- Manifest lookup ----------
 
-def find_matching_manifest(
+# Backoff ceiling between manifest polls.
+MAX_POLL_INTERVAL_S = 15
+# Slack between this machine's clock and the Lambda's when comparing output timestamps.
+MANIFEST_CLOCK_SKEW_S = 300
+
+
+def manifest_pointer_key(output_prefix: str, source_key: str) -> str:
+    """Pointer key written by the callback Lambda (must match ResultPersistor.pointer_key)."""
+    digest = hashlib.sha1(source_key.encode("utf-8")).hexdigest()
+    return f"{output_prefix}by-source/{digest}.json"
+
+
+def _created_before(created_utc: Optional[str], cutoff: datetime) -> bool:
+    """True if a `%Y%m%dT%H%M%SZ` stamp written by the pipeline is older than `cutoff`."""
+    if not created_utc:
+        return False
+    return datetime.strptime(created_utc, "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc) < cutoff
+
+
+def find_manifest_by_pointer(
     s3,
     bucket: str,
     output_prefix: str,
     source_key: str,
-    scan_limit: int = 800,
+    started_at: Optional[datetime] = None,
 ) -> Optional[Tuple[str, Dict[str, Any]]]:
     """
-    Scan recent index.json objects under the output prefix and return the first whose
-    'source_key' matches the just-uploaded source_key.
+    Read the deterministic by-source pointer and then its manifest; None if not written yet.
+    Polls are a HEAD (no body transferred); the pointer is only downloaded once it exists.
+    The pointer is overwritten by every run for the same key, so with `started_at` one
+    written before the upload (minus clock skew) is a previous run's and counts as not found:
+    judged by the HEAD's LastModified, the pointer's created_utc and the manifest's created_utc.
     """
-    objects = list_recent_objects(s3, bucket, output_prefix, max_keys=scan_limit)
-    for obj in objects:
-        key = obj["Key"]
-        if not key.endswith("index.json"):
-            continue
-        try:
-            manifest_json = json.loads(get_object_text(s3, bucket, key))
-            if manifest_json.get("source_key") == source_key:
-                return key, manifest_json
-        except Exception:
-            pass
-    return None
+    pointer_key = manifest_pointer_key(output_prefix, source_key)
+    cutoff = started_at - timedelta(seconds=MANIFEST_CLOCK_SKEW_S) if started_at is not None else None
+    try:
+        head = s3.head_object(Bucket=bucket, Key=pointer_key)
+    except botocore.exceptions.ClientError as e:
+        # HEAD errors carry no body, so S3 reports a missing key as "404" rather than NoSuchKey
+        if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+            return None
+        raise
+    if cutoff is not None and head.get("LastModified") and head["LastModified"] < cutoff:
+        return None
+    pointer = orjson.loads(get_object_bytes(s3, bucket, pointer_key))
+    if cutoff is not None and _created_before(pointer.get("created_utc"), cutoff):
+        return None
+    manifest_key = pointer["manifest_key"]
+    manifest = orjson.loads(get_object_bytes(s3, bucket, manifest_key))
+    if cutoff is not None and _created_before(manifest.get("created_utc"), cutoff):
+        return None
+    return manifest_key, manifest
+
+
+def _read_manifest(s3, bucket: str, key: str) -> Optional[Dict[str, Any]]:
+    try:
+        return orjson.loads(get_object_bytes(s3, bucket, key))
+    except Exception:
+        return None
 
 
-# ---------- Textract parsing ----------
+# Select errors meaning "never available here" rather than a transient failure.
+_SELECT_UNAVAILABLE_CODES = frozenset({"MethodNotAllowed", "NotImplemented", "AccessDenied", "UnsupportedOperation"})
+
 
-def _block_map(blocks: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
-    return {b["Id"]: b for b in blocks if "Id" in b}
+@st.cache_resource
+def _select_unavailable_buckets() -> set:
+    """Buckets where S3 Select was refused; kept across reruns so each pays that once."""
+    return set()
 
 
-def _text_from_block(block: Dict[str, Any], id_to_block: Dict[str, Dict[str, Any]]) -> str:
+def _manifest_matches(s3, bucket: str, key: str, source_key: str) -> bool:
     """
-    Collect text from a block by walking CHILD relationships to WORD/SELECTION_ELEMENT.
+    Ask S3 Select whether the manifest at `key` belongs to `source_key`, so a miss moves a
+    few bytes instead of the whole manifest. Buckets/accounts without S3 Select fall back
+    to a plain GET, and after the first refusal go straight to it.
     """
-    texts: List[str] = []
-    for rel in block.get("Relationships", []) or []:
-        if rel.get("Type") == "CHILD":
-            for cid in rel.get("Ids", []):
-                child = id_to_block.get(cid)
-                if not child:
-                    continue
-                bt = child.get("BlockType")
-                if bt == "WORD" and child.get("Text"):
-                    texts.append(child["Text"])
-                elif bt == "SELECTION_ELEMENT":
-                    # Textract marks selected checkboxes
-                    if child.get("SelectionStatus") == "SELECTED":
-                        texts.append("[X]")
-                    else:
-                        texts.append("[ ]")
-    return " ".join(texts).strip()
+    unavailable = _select_unavailable_buckets()
+    if bucket not in unavailable:
+        literal = source_key.replace("'", "''")
+        try:
+            resp = s3.select_object_content(
+                Bucket=bucket,
+                Key=key,
+                Expression=f"SELECT s.source_key FROM S3Object s WHERE s.source_key = '{literal}'",
+                ExpressionType="SQL",
+                InputSerialization={"JSON": {"Type": "DOCUMENT"}},
+                OutputSerialization={"JSON": {}},
+            )
+            return any(event.get("Records", {}).get("Payload") for event in resp["Payload"])
+        except botocore.exceptions.ClientError as e:
+            if e.response.get("Error", {}).get("Code") in _SELECT_UNAVAILABLE_CODES:
+                unavailable.add(bucket)
+        except botocore.exceptions.BotoCoreError:
+            pass
+    manifest_json = _read_manifest(s3, bucket, key)
+    return bool(manifest_json) and manifest_json.get("source_key") == source_key
 
 
-def parse_kv_pairs(all_blocks: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+def find_matching_manifest(
+    s3,
+    bucket: str,
+    output_prefix: str,
+    source_key: str,
+    scan_limit: int = 800,
+    started_at: Optional[datetime] = None,
+) -> Optional[Tuple[str, Dict[str, Any]]]:
     """
-    Extract (key, value) pairs from KEY_VALUE_SET blocks (Analysis mode).
+    Scan recent index.json objects under the output prefix and return the first whose
+    'source_key' matches the just-uploaded source_key.
+    Legacy fallback for outputs written before the by-source pointer existed.
+
+    Output folders are named <yyyymmdd>/<timestamp>, so `started_at` lets the listing start
+    after older runs. "<date>/" sorts before the same day's "<date>T..." folders of the older
+    undated layout, so those stay in range. Candidates are then checked concurrently via
+    S3 Select and the newest match wins, the only manifest downloaded in full.
     """
-    id_map = _block_map(all_blocks)
-    keys: List[Dict[str, Any]] = [
-        b for b in all_blocks if b.get("BlockType") == "KEY_VALUE_SET" and "KEY" in (b.get("EntityTypes") or [])
-    ]
-    values: List[Dict[str, Any]] = [
-        b for b in all_blocks if b.get("BlockType") == "KEY_VALUE_SET" and "VALUE" in (b.get("EntityTypes") or [])
-    ]
-    # Index VALUE blocks so we can map from KEY via VALUE relationships
-    value_by_id = {b["Id"]: b for b in values if "Id" in b}
-
-    pairs: List[Tuple[str, str]] = []
-    for k in keys:
-        key_text = _text_from_block(k, id_map)
-        # find the VALUE block linked from this KEY
-        val_text = ""
-        for rel in k.get("Relationships", []) or []:
-            if rel.get("Type") == "VALUE":
-                for vid in rel.get("Ids", []):
-                    vblock = value_by_id.get(vid)
-                    if vblock:
-                        val_text = _text_from_block(vblock, id_map)
-                        break
-        if key_text or val_text:
-            pairs.append((key_text, val_text))
-    # de-dup while preserving order (some docs repeat)
-    seen = set()
-    uniq: List[Tuple[str, str]] = []
-    for k, v in pairs:
-        sig = (k, v)
-        if sig in seen:
-            continue
-        seen.add(sig)
-        uniq.append((k, v))
-    return uniq
+    start_after = None
+    if started_at is not None:
+        since = (started_at - timedelta(seconds=MANIFEST_CLOCK_SKEW_S)).astimezone(timezone.utc)
+        start_after = f"{output_prefix}{since:%Y%m%d}/{since:%Y%m%dT%H%M%SZ}"
+    objects = list_recent_objects(s3, bucket, output_prefix, max_keys=scan_limit, start_after=start_after)
+    index_keys = [obj["Key"] for obj in objects if obj["Key"].endswith("index.json")]
+    if not index_keys:
+        return None
+
+    with ThreadPoolExecutor(max_workers=PAGE_FETCH_WORKERS) as pool:
+        futures = [pool.submit(_manifest_matches, s3, bucket, key, source_key) for key in index_keys]
+        # Checks run concurrently but results are taken in listing (newest-first) order,
+        # so an older run for the same source_key can never win by answering first
+        for i, (key, fut) in enumerate(zip(index_keys, futures)):
+            if not fut.result():
+                continue
+            manifest_json = _read_manifest(s3, bucket, key)
+            if manifest_json:
+                for other in futures[i + 1:]:
+                    other.cancel()
+                return key, manifest_json
+    return None
 
 
-def parse_tables(all_blocks: List[Dict[str, Any]]) -> List[pd.DataFrame]:
+# ---------- Textract parsing ----------
+# Block parsing is shared with the callback Lambda (services/textract_parser.py);
+# only the DataFrame wrapping lives here.
+
+def parse_tables(parts: Dict[str, Any]) -> List[pd.DataFrame]:
     """
     Build table DataFrames from TABLE/CELL hierarchy.
     """
-    id_map = _block_map(all_blocks)
-    tables = [b for b in all_blocks if b.get("BlockType") == "TABLE"]
     dataframes: List[pd.DataFrame] = []
+    for grid in textract_parser.parse_tables(parts):
+        header, rows = textract_parser.split_header(grid)
+        dataframes.append(pd.DataFrame(rows, columns=header))
+    return dataframes
 
-    for tbl in tables:
-        # gather CELL ids from TABLE's CHILD rels
-        cell_ids: List[str] = []
-        for rel in tbl.get("Relationships", []) or []:
-            if rel.get("Type") == "CHILD":
-                cell_ids.extend(rel.get("Ids", []))
 
-        cells = [id_map[cid] for cid in cell_ids if id_map.get(cid) and id_map[cid].get("BlockType") == "CELL"]
-        if not cells:
-            continue
+# ---------- Loader for all page JSONs ----------
 
-        max_row = max(c.get("RowIndex", 0) for c in cells)
-        max_col = max(c.get("ColumnIndex", 0) for c in cells)
+def _decode_page(key: str, raw: bytes) -> bytes:
+    """Objects ending in `.gz` are gzipped by the pipeline; older manifests point at plain `.json` pages."""
+    return gzip.decompress(raw) if key.endswith(".gz") else raw
 
-        # Initialize grid with empty strings
-        grid: List[List[str]] = [["" for _ in range(max_col)] for _ in range(max_row)]
 
-        for c in cells:
-            r = c.get("RowIndex", 1) - 1
-            cidx = c.get("ColumnIndex", 1) - 1
-            txt = _text_from_block(c, id_map)
-            # rudimentary merge handling: if the spot already has text, append
-            if grid[r][cidx]:
-                grid[r][cidx] = (grid[r][cidx] + " | " + txt).strip()
-            else:
-                grid[r][cidx] = txt
+def load_all_blocks_from_pages(
+    s3, page_uris: List[str]
+) -> Tuple[List[Dict[str, Any]], List[Tuple[str, str]]]:
+    """
+    Given s3:// URIs for per-call Textract responses, merge all `Blocks` arrays.
+    Pages are downloaded concurrently; blocks keep the original page order.
+    Also returns (uri, raw JSON) per page so the Raw tab needs no second download.
+    """
+    uris = [uri for uri in page_uris if uri.startswith("s3://")]
 
-        df = pd.DataFrame(grid)
-        # Optional: treat first row as header if it looks like one
-        if df.shape[0] > 1 and any(len(str(x)) > 0 for x in df.iloc[0].tolist()):
-            df.columns = [c if c != "" else f"Col{i+1}" for i, c in enumerate(df.iloc[0])]
-            df = df[1:].reset_index(drop=True)
+    blocks: List[Dict[str, Any]] = []
+    raw_pages: List[Tuple[str, str]] = []
 
-        dataframes.append(df)
+    def fetch(uri: str) -> bytes:
+        return get_object_parallel(s3, *_parse_s3_uri(uri), workers=NESTED_RANGE_FETCH_WORKERS)
 
-    return dataframes
+    with ThreadPoolExecutor(max_workers=PAGE_FETCH_WORKERS) as pool:
+        # map() yields results in input order, so parsing stays on this thread and ordered;
+        # orjson decodes the raw bytes directly (no intermediate UTF-8 str copy)
+        for uri, raw in zip(uris, pool.map(fetch, uris)):
+            raw = _decode_page(uri, raw)
+            js = orjson.loads(raw)
+            blocks.extend(js.get("Blocks", []) or [])
+            raw_pages.append((uri, raw.decode("utf-8")))
+    return blocks, raw_pages
 
 
-def extract_lines(all_blocks: List[Dict[str, Any]]) -> str:
+def load_blocks_from_blob(s3, blocks_uri: str) -> Tuple[List[Dict[str, Any]], List[Tuple[str, str]]]:
     """
-    Combined text from LINE blocks (works for both TextDetection and Analysis).
+    Read the single `blocks.ndjson.gz` object (one Textract response per line) with one GET.
+    Returns all blocks in page order plus (uri, raw JSON line) per page for display.
     """
-    lines = [b.get("Text", "") for b in all_blocks if b.get("BlockType") == "LINE" and b.get("Text")]
-    return "\n".join(lines)
+    raw = _decode_page(blocks_uri, get_object_parallel(s3, *_parse_s3_uri(blocks_uri)))
 
+    blocks: List[Dict[str, Any]] = []
+    raw_pages: List[Tuple[str, str]] = []
+    for line in raw.splitlines():
+        if not line:
+            continue
+        js = orjson.loads(line)
+        blocks.extend(js.get("Blocks", []) or [])
+        raw_pages.append((blocks_uri, line.decode("utf-8")))
+    return blocks, raw_pages
 
-# ---------- Loader for all page JSONs ----------
 
-def load_all_blocks_from_pages(s3, page_uris: List[str]) -> List[Dict[str, Any]]:
+def load_extracted_view(s3, extracted: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Given s3:// URIs for per-call Textract responses, merge all `Blocks` arrays.
+    Read the text / KV / table files the callback Lambda precomputed next to index.json:
+    a few small GETs and no block parsing. Same keys as `load_parsed_results`.
     """
-    blocks: List[Dict[str, Any]] = []
-    for uri in page_uris:
-        if not uri.startswith("s3://"):
-            continue
-        _, _, rest = uri.partition("s3://")
-        bkt, _, key = rest.partition("/")
-        raw = get_object_text(s3, bkt, key)
-        js = json.loads(raw)
-        for b in js.get("Blocks", []) or []:
-            blocks.append(b)
-    return blocks
+    uris = [extracted["lines"], extracted["kv"], *extracted.get("tables", [])]
+    with ThreadPoolExecutor(max_workers=PAGE_FETCH_WORKERS) as pool:
+        bodies = list(pool.map(lambda u: get_object_bytes(s3, *_parse_s3_uri(u)), uris))
+
+    def read_csv(raw: bytes) -> pd.DataFrame:
+        # header=None: pandas would rename a repeated header cell ("Amount" -> "Amount.1")
+        df = pd.read_csv(io.BytesIO(raw), dtype=str, keep_default_na=False, header=None)
+        header, df = df.iloc[0].tolist(), df.iloc[1:].reset_index(drop=True)
+        if header != [str(j) for j in range(len(header))]:
+            df.columns = header
+        # else: a header-less table, written with its index labels; keep integer columns
+        return df
+
+    return {
+        "block_count": extracted.get("block_count", 0),
+        "text": bodies[0].decode("utf-8"),
+        "kv_pairs": list(read_csv(bodies[1]).itertuples(index=False, name=None)),
+        "tables": [read_csv(raw) for raw in bodies[2:]],
+    }
+
+
+def _load_pages(
+    s3, blocks_uri: Optional[str], page_uris: Tuple[str, ...]
+) -> Tuple[List[Dict[str, Any]], List[Tuple[str, str]]]:
+    if blocks_uri:
+        return load_blocks_from_blob(s3, blocks_uri)
+    return load_all_blocks_from_pages(s3, list(page_uris))
+
+
+# ---------- Cached results ----------
+# Manifests and their pages are immutable once written, so everything derived from them is
+# cached by (region, manifest_key) and survives reruns (tab switches, widget changes).
+# Arguments are plain strings/tuples: cheap to hash, unlike the S3 client or block lists.
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def load_parsed_results(
+    region: str,
+    manifest_key: str,
+    blocks_uri: Optional[str],
+    page_uris: Tuple[str, ...],
+    extracted: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    s3 = s3_client(region)
+    if extracted:
+        # Raw pages are only downloaded if the Raw tab asks for them (load_raw_pages)
+        return {**load_extracted_view(s3, extracted), "raw_pages": None}
+    blocks, raw_pages = _load_pages(s3, blocks_uri, page_uris)
+    parts = textract_parser.partition_blocks(blocks)
+    return {
+        "block_count": len(blocks),
+        "raw_pages": raw_pages,
+        "text": textract_parser.extract_lines(parts),
+        "kv_pairs": textract_parser.parse_kv_pairs(parts),
+        "tables": parse_tables(parts),
+    }
+
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def load_raw_pages(
+    region: str,
+    manifest_key: str,
+    blocks_uri: Optional[str],
+    page_uris: Tuple[str, ...],
+) -> List[Tuple[str, str]]:
+    return _load_pages(s3_client(region), blocks_uri, page_uris)[1]
 
 
 # ---------- UI ----------
@@ -295,6 +473,8 @@ uploaded = st.file_uploader("Upload policy PDF", type=["pdf"])
 
 if "upload_info" not in st.session_state:
     st.session_state["upload_info"] = None  # dict with {key, s3_uri, started_at}
+if "found_manifest" not in st.session_state:
+    st.session_state["found_manifest"] = None  # (source_key, manifest_key, manifest) once located
 
 col1, col2 = st.columns([1, 1], vertical_alignment="center")
 
@@ -313,6 +493,7 @@ with col1:
                     "s3_uri": s3_uri,
                     "started_at": datetime.now(timezone.utc).isoformat(),
                 }
+                st.session_state["found_manifest"] = None
                 st.success(f"Uploaded to {s3_uri}")
                 st.info("Your Lambda ingest will now run automatically (via S3 event).")
             except botocore.exceptions.ClientError as e:
@@ -330,6 +511,7 @@ with col2:
     if st.session_state["upload_info"]:
         if st.button("Reset", use_container_width=True):
             st.session_state["upload_info"] = None
+            st.session_state["found_manifest"] = None
 
 st.divider()
 st.subheader("2) Wait for Results → View Output")
@@ -339,28 +521,47 @@ if st.session_state["upload_info"]:
     st.write(f"Watching for **index.json** with `source_key={source_key}`")
 
     max_wait = st.slider("Max wait (seconds)", 10, 600, 180, 10)
-    poll_interval = st.slider("Poll interval (seconds)", 2, 20, 5, 1)
+    poll_interval = st.slider("Initial poll interval (seconds)", 1, MAX_POLL_INTERVAL_S, 1, 1)
+    legacy_scan = st.checkbox(
+        "Also scan for legacy manifests (lists the output prefix on every poll)",
+        value=False,
+    )
 
     placeholder = st.empty()
     result_container = st.container()
 
     start_ts = time.time()
     found: Optional[Tuple[str, Dict[str, Any]]] = None
+    cached = st.session_state["found_manifest"]
+    if cached and cached[0] == source_key:
+        # Already located on an earlier rerun; manifests never change, so skip polling
+        found = (cached[1], cached[2])
 
     with st.spinner("Polling for Textract results…"):
-        while time.time() - start_ts < max_wait:
+        while not found and time.time() - start_ts < max_wait:
             elapsed = int(time.time() - start_ts)
             placeholder.info(f"⏳ Elapsed: {elapsed}s — checking for manifest…")
-            found = find_matching_manifest(
+            found = find_manifest_by_pointer(
                 s3=s3,
                 bucket=cfg["S3_BUCKET"],
                 output_prefix=cfg["POLICY_OUTPUT_PREFIX"],
                 source_key=source_key,
-                scan_limit=800,
+                started_at=datetime.fromisoformat(st.session_state["upload_info"]["started_at"]),
             )
+            if not found and legacy_scan:
+                found = find_matching_manifest(
+                    s3=s3,
+                    bucket=cfg["S3_BUCKET"],
+                    output_prefix=cfg["POLICY_OUTPUT_PREFIX"],
+                    source_key=source_key,
+                    scan_limit=800,
+                    started_at=datetime.fromisoformat(st.session_state["upload_info"]["started_at"]),
+                )
             if found:
                 break
-            time.sleep(poll_interval)
+            # Exponential backoff: most of the wait is Textract itself, so poll less as time passes
+            time.sleep(min(poll_interval, max(0.0, max_wait - (time.time() - start_ts))))
+            poll_interval = min(poll_interval * 2, MAX_POLL_INTERVAL_S)
 
     if not found:
         placeholder.warning(
@@ -369,21 +570,25 @@ if st.session_state["upload_info"]:
         )
     else:
         manifest_key, manifest = found
+        st.session_state["found_manifest"] = (source_key, manifest_key, manifest)
         placeholder.empty()
         with result_container:
             st.success("Textract output found!")
             st.caption(f"Manifest: `s3://{cfg['S3_BUCKET']}/{manifest_key}`")
-            st.code(json.dumps(manifest, indent=2), language="json")
+            st.code(orjson.dumps(manifest, option=orjson.OPT_INDENT_2).decode(), language="json")
 
+            blocks_uri: Optional[str] = manifest.get("blocks")
             page_uris: List[str] = manifest.get("pages", [])
-            if not page_uris:
-                st.warning("Manifest has no 'pages'. Check your callback Lambda persistence.")
+            if not blocks_uri and not page_uris:
+                st.warning("Manifest has no 'blocks' or 'pages'. Check your callback Lambda persistence.")
             else:
-                # Load all blocks across pages once
+                # Load and parse all pages once per manifest; reruns hit the cache
                 with st.spinner("Loading and parsing Textract pages…"):
-                    all_blocks = load_all_blocks_from_pages(s3, page_uris)
+                    results = load_parsed_results(
+                        cfg["AWS_REGION"], manifest_key, blocks_uri, tuple(page_uris), manifest.get("extracted")
+                    )
                 st.write(
-                    f"**Blocks loaded:** {len(all_blocks)} "
+                    f"**Blocks loaded:** {results['block_count']} "
                     f"(LINES, WORDS, TABLES, FORMS, etc.)"
                 )
 
@@ -393,7 +598,7 @@ if st.session_state["upload_info"]:
                 )
 
                 with tab_text:
-                    text = extract_lines(all_blocks)
+                    text = results["text"]
                     st.text_area("Detected Text (LINE blocks)", value=text, height=420)
                     st.download_button(
                         "Download Text (.txt)",
@@ -403,7 +608,7 @@ if st.session_state["upload_info"]:
                     )
 
                 with tab_kv:
-                    kv_pairs = parse_kv_pairs(all_blocks)
+                    kv_pairs = results["kv_pairs"]
                     if not kv_pairs:
                         st.info("No KEY_VALUE_SET blocks detected (this is expected for Text Detection jobs).")
                     else:
@@ -413,7 +618,7 @@ if st.session_state["upload_info"]:
                         st.download_button("Download KV CSV", data=csv, file_name="textract_kv.csv", mime="text/csv")
 
                 with tab_tables:
-                    tables = parse_tables(all_blocks)
+                    tables = results["tables"]
                     if not tables:
                         st.info("No TABLES detected. Use StartDocumentAnalysis(FORMS,TABLES) to extract tables.")
                     else:
@@ -429,11 +634,14 @@ if st.session_state["upload_info"]:
                                 )
 
                 with tab_raw:
-                    for i, uri in enumerate(page_uris, start=1):
+                    # Same bytes the blocks were parsed from: no extra GET per page.
+                    # With a precomputed view nothing was downloaded yet, so fetch on request.
+                    raw_pages = results["raw_pages"]
+                    if raw_pages is None and st.checkbox("Load raw page JSON (downloads all pages)", value=False):
+                        with st.spinner("Loading Textract pages…"):
+                            raw_pages = load_raw_pages(cfg["AWS_REGION"], manifest_key, blocks_uri, tuple(page_uris))
+                    for i, (uri, raw) in enumerate(raw_pages or [], start=1):
                         with st.expander(f"Page JSON {i} – {uri}", expanded=False):
-                            _, _, rest = uri.partition("s3://")
-                            bkt, _, key = rest.partition("/")
-                            raw = get_object_text(s3, bkt, key)
                             st.code(raw, language="json")
 else:
     st.info("Upload a PDF and click **Upload to S3 & Start Pipeline** to begin.")
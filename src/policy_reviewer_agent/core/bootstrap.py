@@ -0,0 +1,28 @@
+"""
+Per-container initialization shared by the Lambda handlers.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Optional, Tuple
+
+from .settings import Settings
+from ..orchestrators.policy_pipeline import PolicyPipeline
+
+logger = logging.getLogger(__name__)
+
+
+def init_pipeline() -> Tuple[Optional[Settings], Optional[PolicyPipeline], Optional[Exception]]:
+    """
+    Build settings and the pipeline once per container, during INIT; warm invocations
+    reuse them and their underlying boto3 clients. Returns (settings, pipeline, error):
+    a failure is returned rather than raised so the handler module always imports and
+    can surface it as ConfigError per invocation.
+    """
+    try:
+        settings = Settings.from_env()
+        return settings, PolicyPipeline(settings), None
+    except Exception as e:  # noqa: BLE001
+        logger.error("Configuration error", exc_info=True)
+        return None, None, e
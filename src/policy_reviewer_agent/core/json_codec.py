@@ -0,0 +1,25 @@
+"""
+JSON encoding for logs, audit events and S3 payloads.
+
+Uses orjson when it is installed (local dev, the Streamlit app) and falls back to the
+stdlib encoder otherwise: the Lambda package is zipped from `src/` and does not bundle
+third-party wheels.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    # Optional speed-up; absent from the plain `src/` Lambda zip
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+
+def dumps(obj: Any) -> bytes:
+    """Compact UTF-8 JSON bytes (non-ASCII kept as is, non-str dict keys stringified)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
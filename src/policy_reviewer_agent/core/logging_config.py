@@ -2,15 +2,23 @@
 Structured logging setup (CloudWatch-friendly).
 """
 
-import json
+import atexit
+import copy
 import logging
 import os
-from typing import Any, Dict
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+from . import json_codec
 
 
 class JsonFormatter(logging.Formatter):
     """JSON log formatter with stable keys."""
 
+    # Fixed tuple, not a set: emitted field order must not depend on the string hash seed
+    _CONTEXT_ORDER = ("stage", "key", "job_id", "status", "latency_ms")
+
     def format(self, record: logging.LogRecord) -> str:  # type: ignore[override]
         payload: Dict[str, Any] = {
             "level": record.levelname,
@@ -18,22 +26,55 @@ class JsonFormatter(logging.Formatter):
             "logger": record.name,
         }
         # Attach contextual fields if the caller added them to `record.__dict__`
-        for k in ("stage", "key", "job_id", "status", "latency_ms"):
-            if k in record.__dict__:
-                payload[k] = record.__dict__[k]
-        if record.exc_info:
+        attrs = record.__dict__
+        payload.update({k: attrs[k] for k in type(self)._CONTEXT_ORDER if k in attrs})
+        if record.exc_info is not None:
             payload["exception"] = self.formatException(record.exc_info)
-        return json.dumps(payload, ensure_ascii=False)
+        # orjson when available: UTF-8 natively (no ensure_ascii) and much faster than stdlib json
+        return json_codec.dumps(payload).decode()
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Enqueue records unformatted so JSON encoding happens on the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve %-args now (they may be mutated after the call returns) but keep
+        # exc_info so JsonFormatter can still emit a separate "exception" field.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+# One listener (and its writer thread) per process/container.
+_LISTENER: Optional[QueueListener] = None
+_LOG_INITIALIZED = False
 
 
 def setup_logging(level: str | int = None) -> None:
-    """Initialize root logger with JSON formatting."""
+    """
+    Initialize root logger with JSON formatting written from a background thread.
+    Runs once per process; later calls are no-ops so the listener is never torn down.
+    """
+    global _LISTENER, _LOG_INITIALIZED
+    if _LOG_INITIALIZED:
+        return
     root = logging.getLogger()
     if not level:
         level = os.getenv("LOG_LEVEL", "INFO")
     root.setLevel(level)
-    # Clear existing handlers (e.g., when re-importing in AWS Lambda warm starts)
-    root.handlers.clear()
     h = logging.StreamHandler()
     h.setFormatter(JsonFormatter())
-    root.addHandler(h)
+    _LISTENER = QueueListener(queue.Queue(), h)
+    _LISTENER.start()
+    atexit.register(_LISTENER.stop)
+    # Replace pre-installed handlers (e.g., the AWS Lambda runtime's default one)
+    root.handlers.clear()
+    root.addHandler(_DeferredQueueHandler(_LISTENER.queue))
+    _LOG_INITIALIZED = True
+
+
+def flush_logging() -> None:
+    """Block until queued records are written; call before a Lambda invocation returns."""
+    if _LISTENER is not None:
+        _LISTENER.queue.join()
@@ -15,14 +15,15 @@ import json
 import logging
 from typing import Any, Dict, Optional
 
-from ..core.logging_config import setup_logging
-from ..core.settings import Settings
+from ..core.bootstrap import init_pipeline
+from ..core.logging_config import flush_logging, setup_logging
 from ..core.exceptions import ConfigError, TextractJobError
-from ..orchestrators.policy_pipeline import PolicyPipeline
 
 setup_logging()
 logger = logging.getLogger(__name__)
 
+_SETTINGS, _PIPELINE, _INIT_ERROR = init_pipeline()
+
 
 def _parse_sns(event: Dict[str, Any]) -> Dict[str, Optional[str]]:
     """
@@ -44,17 +45,10 @@ def _parse_sns(event: Dict[str, Any]) -> Dict[str, Optional[str]]:
     return {"job_id": job_id, "status": status, "source_key": source_key, "mode": mode}
 
 
-def handler(event: Dict[str, Any], _context: Any) -> Dict[str, Any]:
+def _handle_notification(event: Dict[str, Any]) -> Dict[str, Any]:
     """
-    AWS Lambda handler for SNS -> fetch & persist.
+    Fetch & persist the results of the Textract job named in the SNS event.
     """
-    try:
-        cfg = Settings.from_env()
-    except Exception as e:  # noqa: BLE001
-        logger.error("Configuration error", exc_info=True)
-        raise ConfigError(str(e)) from e
-
-    pipeline = PolicyPipeline(cfg)
     meta = _parse_sns(event)
 
     job_id = meta["job_id"]
@@ -74,9 +68,27 @@ def handler(event: Dict[str, Any], _context: Any) -> Dict[str, Any]:
         logger.error("Missing JobId in SNS", extra={"stage": "callback"})
         raise TextractJobError("Missing JobId in SNS message")
 
-    manifest = pipeline.fetch_and_persist(job_id, mode, source_key)
+    manifest = _PIPELINE.fetch_and_persist(job_id, mode, source_key)
+    _PIPELINE.flush_audit()
     logger.info(
         "Callback complete",
         extra={"stage": "callback", "job_id": job_id, "key": source_key, "status": "SUCCESS"},
     )
     return {"status": "ok", "manifest": manifest}
+
+
+def handler(event: Dict[str, Any], _context: Any) -> Dict[str, Any]:
+    """
+    AWS Lambda handler for SNS -> fetch & persist.
+    """
+    if _INIT_ERROR is not None:
+        raise ConfigError(str(_INIT_ERROR)) from _INIT_ERROR
+
+    if event.get("warmer"):
+        # Scheduled keep-warm ping: INIT already ran, nothing else to do.
+        return {"warm": True}
+
+    try:
+        return _handle_notification(event)
+    finally:
+        flush_logging()
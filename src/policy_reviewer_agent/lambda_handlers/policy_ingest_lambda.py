@@ -11,82 +11,105 @@ from __future__ import annotations
 
 import json
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import unquote_plus
 
-import boto3
 from botocore.exceptions import ClientError
 
-from ..core.logging_config import setup_logging
-from ..core.settings import Settings
-from ..core.exceptions import ConfigError, ValidationError
-from ..orchestrators.policy_pipeline import PolicyPipeline
+from ..core.bootstrap import init_pipeline
+from ..core.logging_config import flush_logging, setup_logging
+from ..core.exceptions import ConfigError, TextractJobError, ValidationError
 
 setup_logging()
 logger = logging.getLogger(__name__)
 
+_SETTINGS, _PIPELINE, _INIT_ERROR = init_pipeline()
 
 
+def _put_id(obj: Dict[str, Any]) -> Optional[str]:
+    """
+    Identity of the PUT that produced this record: the S3 `sequencer` (unique per PUT of a
+    key, unchanged when S3 redelivers the event), plus `versionId` on versioned buckets.
+    Unlike the eTag, it differs when identical bytes are uploaded to the same key again.
+    """
+    parts = [obj[k] for k in ("versionId", "sequencer") if obj.get(k)]
+    return "/".join(parts) or None
+
 
-def _extract_s3_key(event: Dict[str, Any]) -> str:
+def _extract_s3_objects(event: Dict[str, Any]) -> List[Tuple[str, Optional[str]]]:
     """
-    Extract the S3 object key from the event. Raises KeyError if malformed.
+    Extract every (object key, PUT id) from the event. Raises KeyError if malformed.
     """
-    record = event["Records"][0]
-    raw_key = record["s3"]["object"]["key"]
     # S3 keys are URL-encoded in events; decode them.
-    return unquote_plus(raw_key)
+    return [(unquote_plus(r["s3"]["object"]["key"]), _put_id(r["s3"]["object"])) for r in event["Records"]]
 
 
-def handler(event: Dict[str, Any], _context: Any) -> Dict[str, Any]:
+def _is_missing_object(err: TextractJobError) -> bool:
     """
-    AWS Lambda handler.
-    Returns a JSON-friendly dict describing the started job.
+    True if Textract failed to start because the source S3 object is missing/unreadable.
     """
-    try:
-        cfg = Settings.from_env()
-    except Exception as e:  # noqa: BLE001
-        logger.error("Configuration error", exc_info=True)
-        raise ConfigError(str(e)) from e
+    cause = err.__cause__
+    if not isinstance(cause, ClientError):
+        return False
+    return cause.response.get("Error", {}).get("Code") == "InvalidS3ObjectException"
 
-    pipeline = PolicyPipeline(cfg)
 
+def _start_one(object_key: str, put_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Validate one key and start its Textract job.
+    Returns a JSON-friendly dict describing the started job or the per-key rejection.
+    Starts are keyed on the record's PUT id, so when a later key fails and S3 retries the
+    whole event, keys that already started get their existing job back.
+    """
     # Decide analysis vs text detection. You can use key-based rules if needed.
     # Here we default to text detection; toggle to analysis by naming convention if desired.
     try:
-        object_key = _extract_s3_key(event)
-        import boto3
-        from botocore.exceptions import ClientError
-
-        s3_bucket = cfg.s3_bucket
-        try:
-            boto3.client("s3").head_object(Bucket=s3_bucket, Key=object_key)
-            logger.info(
-                "Preflight HEAD OK",
-                extra={"stage": "ingest", "bucket": s3_bucket, "key": object_key, "status": "OK"},
-            )
-        except ClientError as ce:
-            logger.error(
-                "Preflight HEAD failed",
-                extra={"stage": "ingest", "bucket": s3_bucket, "key": object_key},
-                exc_info=True,
-            )
-            return {
-                "error": "s3_object_not_found",
-                "bucket": s3_bucket,
-                "key": object_key,
-                "detail": str(ce),
-            }
-        result = pipeline.validate_and_start(object_key, analysis=False)
-        logger.info(
-            "Ingest started",
-            extra={"stage": "ingest", "key": object_key, "job_id": result.job_id, "status": "STARTED"},
-        )
-        return {"job_id": result.job_id, "key": object_key, "mode": result.mode}
+        result = _PIPELINE.validate_and_start(object_key, analysis=False, put_id=put_id)
     except ValidationError:
-        logger.warning("Validation failed", extra={"stage": "ingest"}, exc_info=True)
+        logger.warning("Validation failed", extra={"stage": "ingest", "key": object_key}, exc_info=True)
         # Swallowing to avoid S3 retry storm; or re-raise for DLQ based on your policy.
-        return {"error": "validation_failed"}
+        return {"error": "validation_failed", "key": object_key}
+    except TextractJobError as e:
+        # Textract rejects missing/unreadable sources itself, so no preflight HEAD is needed.
+        if not _is_missing_object(e):
+            raise
+        logger.error(
+            "Source object not readable by Textract",
+            extra={"stage": "ingest", "key": object_key},
+            exc_info=True,
+        )
+        return {
+            "error": "s3_object_not_found",
+            "bucket": _SETTINGS.s3_bucket,
+            "key": object_key,
+            "detail": str(e),
+        }
+    logger.info(
+        "Ingest started",
+        extra={"stage": "ingest", "key": object_key, "job_id": result.job_id, "status": "STARTED"},
+    )
+    return {"job_id": result.job_id, "key": object_key, "mode": result.mode}
+
+
+def handler(event: Dict[str, Any], _context: Any) -> Dict[str, Any]:
+    """
+    AWS Lambda handler.
+    Starts one job per S3 record; returns {"results": [...]} with one entry per key.
+    """
+    if _INIT_ERROR is not None:
+        raise ConfigError(str(_INIT_ERROR)) from _INIT_ERROR
+
+    if event.get("warmer"):
+        # Scheduled keep-warm ping: INIT already ran, nothing else to do.
+        return {"warm": True}
+
+    try:
+        return {"results": [_start_one(key, put_id) for key, put_id in _extract_s3_objects(event)]}
     except Exception as e:  # noqa: BLE001
         logger.error("Unhandled error in ingest", extra={"stage": "ingest"}, exc_info=True)
         raise
+    finally:
+        try:
+            _PIPELINE.flush_audit()
+        finally:
+            flush_logging()
@@ -4,12 +4,14 @@ Orchestrator that coordinates S3 validation, Textract job start, and result pers
 
 from __future__ import annotations
 
+import hashlib
 import logging
 from dataclasses import dataclass
 from typing import Iterable, Optional
 
 from ..core.exceptions import ValidationError
 from ..core.settings import Settings
+from ..services.aws_session import get_session
 from ..services.file_utils import is_pdf_key, is_under_prefix
 from ..services.s3_client import S3Client
 from ..services.textract_client import TextractClient
@@ -32,28 +34,42 @@ class PolicyPipeline:
 
     def __init__(self, cfg: Settings):
         self._cfg = cfg
-        self._s3 = S3Client(cfg.s3_bucket)
-        self._tx = TextractClient(cfg.aws_region, cfg.textract_sns_topic_arn, cfg.textract_publish_role_arn)
+        # One session (credentials resolved at construction) shared by both service clients
+        session = get_session()
+        self._s3 = S3Client(cfg.s3_bucket, session=session)
+        self._tx = TextractClient(
+            cfg.aws_region, cfg.textract_sns_topic_arn, cfg.textract_publish_role_arn, session=session
+        )
         self._persist = ResultPersistor(self._s3, cfg.policy_output_prefix)
         self._audit = Auditor(self._s3)
 
     # ---------- INGEST STAGE (S3 -> start Textract) ----------
 
-    def validate_and_start(self, object_key: str, analysis: bool = False) -> IngestResult:
+    def validate_and_start(self, object_key: str, analysis: bool = False, put_id: Optional[str] = None) -> IngestResult:
         """
         Validate the S3 key and start an async Textract job.
+        With `put_id` (identifies the PUT behind the event, e.g. its S3 sequencer), the start
+        is idempotent: a retried event gets the original JobId back instead of a duplicate
+        job, while a fresh upload of the same bytes still starts a new one.
         Raises ValidationError if key is invalid.
         """
-        if not is_under_prefix(object_key, self._cfg.policy_pdf_prefix):
-            raise ValidationError(f"Key not under prefix: {object_key} (expected {self._cfg.policy_pdf_prefix})")
+        # Cheaper suffix check first
         if not is_pdf_key(object_key):
             raise ValidationError(f"Not a PDF: {object_key}")
+        prefix = self._cfg.policy_pdf_prefix
+        if not is_under_prefix(object_key, prefix):
+            raise ValidationError(f"Key not under prefix: {object_key} (expected {prefix})")
 
         mode = "analysis" if analysis else "text"
+        token = None
+        if put_id:
+            # ClientRequestToken allows [a-zA-Z0-9-_] up to 64 chars: a hex digest fits
+            seed = f"{self._cfg.s3_bucket}/{object_key}/{put_id}/{mode}"
+            token = hashlib.sha256(seed.encode("utf-8")).hexdigest()
         if analysis:
-            job_id = self._tx.start_analysis(self._cfg.s3_bucket, object_key)
+            job_id = self._tx.start_analysis(self._cfg.s3_bucket, object_key, client_request_token=token)
         else:
-            job_id = self._tx.start_text_detection(self._cfg.s3_bucket, object_key)
+            job_id = self._tx.start_text_detection(self._cfg.s3_bucket, object_key, client_request_token=token)
 
         self._audit.write_event(
             {
@@ -89,3 +105,7 @@ class PolicyPipeline:
             }
         )
         return manifest
+
+    def flush_audit(self) -> None:
+        """Write audit events buffered during this invocation (one S3 PutObject)."""
+        self._audit.flush()
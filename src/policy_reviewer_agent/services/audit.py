@@ -4,37 +4,57 @@ Simple audit trail writer (to S3 JSON lines).
 
 from __future__ import annotations
 
-import json
 import logging
+import uuid
 from datetime import datetime, timezone
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
 from .s3_client import S3Client
+from ..core import json_codec
 from ..core.exceptions import ResultPersistError
 
 logger = logging.getLogger(__name__)
 
 
 class Auditor:
-    """Append-only audit trail in s3://bucket/policy/audit/YYYY/MM/DD/events.jsonl"""
+    """Append-only audit trail in s3://bucket/policy/audit/YYYY/MM/DD/events-<uuid>.jsonl"""
 
     def __init__(self, s3: S3Client, base_prefix: str = "policy/audit"):
         self._s3 = s3
         self._base = base_prefix.strip("/")
+        self._buffer: List[Dict[str, Any]] = []
+        # Time of the first buffered event; the flush is filed under its day
+        self._first_at: Optional[datetime] = None
 
-    def write_event(self, event: Dict[str, Any]) -> str:
+    def write_event(self, event: Dict[str, Any]) -> None:
         """
-        Append an audit record (we emit whole file per call to keep it simple in S3).
-        Returns s3 uri of the written object.
+        Buffer a timestamped audit record; nothing is sent to S3 until `flush()`.
         """
+        now = datetime.now(timezone.utc)
+        if not self._buffer:
+            self._first_at = now
+        self._buffer.append({"ts": now.isoformat(), **event})
+
+    def flush(self) -> Optional[str]:
+        """
+        Write all buffered records as one JSONL object (a single PutObject per invocation).
+        Each flush gets its own key, so concurrent invocations never overwrite each other.
+        Returns s3 uri of the written object, or None if nothing was buffered.
+        """
+        if not self._buffer:
+            return None
         try:
-            now = datetime.now(timezone.utc)
-            y, m, d = now.strftime("%Y"), now.strftime("%m"), now.strftime("%d")
-            key = f"{self._base}/{y}/{m}/{d}/events.jsonl"
-            line = json.dumps({"ts": now.isoformat(), **event}, ensure_ascii=False) + "\n"
-            # naive append by fetching existing is overkill; we just put a one-line object per call
-            # and rely on S3 inventory/listing; or you can aggregate via Firehose later.
-            return self._s3.put_bytes(key, line.encode("utf-8"), "application/x-ndjson")
+            # Same clock reading as the first event's "ts", so a flush after midnight
+            # still lands under the day its events were recorded
+            day = self._first_at.strftime("%Y/%m/%d")
+            key = f"{self._base}/{day}/events-{uuid.uuid4().hex}.jsonl"
+            body = b"".join(json_codec.dumps(e) + b"\n" for e in self._buffer)
+            # One object per flush under the day prefix; readers list the prefix (or a
+            # periodic job compacts it). Firehose can replace this if volume grows.
+            uri = self._s3.put_bytes(key, body, "application/x-ndjson")
+            # Only drop records once written, so a failed flush is retried by the next one.
+            self._buffer.clear()
+            return uri
         except Exception as e:  # noqa: BLE001
             logger.error("Audit write failed", extra={"stage": "audit"}, exc_info=True)
             raise ResultPersistError(str(e)) from e
@@ -0,0 +1,32 @@
+"""
+Shared boto3 session and client configuration for the AWS service wrappers.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+from boto3.session import Session
+from botocore.config import Config
+
+# Keep sockets/TLS sessions alive between successive calls, with pool headroom so the
+# background Textract page prefetch never waits on (or tears down) a connection.
+BOTO_CONFIG = Config(
+    tcp_keepalive=True,
+    retries={"mode": "standard", "max_attempts": 3},
+    max_pool_connections=32,
+)
+
+
+@lru_cache(maxsize=None)
+def get_session() -> Session:
+    """
+    Process-wide session: credential resolution is done once and shared by all clients.
+    Credentials are resolved eagerly (during Lambda INIT) so the first request never walks
+    the provider chain; botocore refreshes temporary credentials ahead of expiry on its own.
+    """
+    session = Session()
+    creds = session.get_credentials()
+    if creds is not None:
+        creds.get_frozen_credentials()
+    return session
@@ -5,17 +5,23 @@ Lightweight file utilities: key validation, suffix checks.
 from __future__ import annotations
 
 import mimetypes
+from functools import lru_cache
 
 
 def is_pdf_key(object_key: str) -> bool:
     """True if the object key looks like a PDF."""
-    return object_key.lower().endswith(".pdf")
+    # Case-fold only the 4-char tail instead of the whole key
+    return object_key[-4:].lower() == ".pdf"
+
+
+@lru_cache(maxsize=64)
+def _normalize_prefix(prefix: str) -> str:
+    return prefix if prefix.endswith("/") else (prefix + "/")
 
 
 def is_under_prefix(object_key: str, expected_prefix: str) -> bool:
     """True if object_key is under the expected prefix."""
-    p = expected_prefix if expected_prefix.endswith("/") else (expected_prefix + "/")
-    return object_key.startswith(p)
+    return object_key.startswith(_normalize_prefix(expected_prefix))
 
 
 def guess_mime_from_key(object_key: str) -> str | None:
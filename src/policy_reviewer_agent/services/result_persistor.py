@@ -1,15 +1,21 @@
 """
-Result persistence: write raw Textract JSON pages and a compact index to S3.
+Result persistence: write raw Textract JSON pages (one gzipped NDJSON blob), a precomputed
+extracted view (text / KV / table CSVs) and a compact index to S3.
 """
 
 from __future__ import annotations
 
-import json
+import csv
+import gzip
+import hashlib
+import io
 import logging
-from datetime import datetime
-from typing import Dict, Iterable, List
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Sequence
 
+from . import textract_parser
 from .s3_client import S3Client
+from ..core import json_codec
 from ..core.exceptions import ResultPersistError
 
 logger = logging.getLogger(__name__)
@@ -22,27 +28,86 @@ class ResultPersistor:
         self._s3 = s3
         self._out = output_prefix.rstrip("/")
 
+    def pointer_key(self, source_key: str) -> str:
+        """Key of the by-source pointer to the latest manifest for `source_key`."""
+        digest = hashlib.sha1(source_key.encode("utf-8")).hexdigest()
+        return f"{self._out}/by-source/{digest}.json"
+
+    def _put_csv(self, key: str, header: Sequence[str], rows: Iterable[Sequence[str]]) -> str:
+        out = io.StringIO()
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(header)
+        writer.writerows(rows)
+        return self._s3.put_bytes(key, out.getvalue().encode("utf-8"), "text/csv")
+
+    def _persist_extracted_view(self, base_prefix: str, parts: Dict[str, Any], block_count: int) -> Dict[str, Any]:
+        """
+        Write lines.txt, kv.csv and tables/table_{i}.csv so readers can render results
+        without downloading and re-parsing every block. CSVs match the UI's own export.
+        """
+        lines_uri = self._s3.put_bytes(
+            f"{base_prefix}/lines.txt",
+            textract_parser.extract_lines(parts).encode("utf-8"),
+            "text/plain; charset=utf-8",
+        )
+        kv_uri = self._put_csv(f"{base_prefix}/kv.csv", ("Key", "Value"), textract_parser.parse_kv_pairs(parts))
+
+        table_uris: List[str] = []
+        for i, grid in enumerate(textract_parser.parse_tables(parts), start=1):
+            header, rows = textract_parser.split_header(grid)
+            if header is None:
+                header = [str(j) for j in range(len(grid[0]))]  # what DataFrame.to_csv writes
+            table_uris.append(self._put_csv(f"{base_prefix}/tables/table_{i}.csv", header, rows))
+
+        return {"block_count": block_count, "lines": lines_uri, "kv": kv_uri, "tables": table_uris}
+
     def persist_text_results(self, job_id: str, source_key: str, pages: Iterable[Dict]) -> Dict:
         """
-        Persist each page as JSON and an index.json for quick lookup.
+        Persist all pages as one gzipped NDJSON object (`blocks.ndjson.gz`, one
+        `{"page": i, **response}` line per Textract page) and an index.json for quick lookup.
+        `pages` is consumed lazily: each page is compressed and partitioned as it arrives,
+        and the gzip stream goes to S3 in multipart parts, so at most one part of compressed
+        output is buffered. The blocks the extracted view needs are retained until it is
+        written (see `_persist_extracted_view`).
         Returns a manifest dict with URIs.
         """
         try:
-            ts = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
-            base_prefix = f"{self._out}/{ts}/{job_id}"
-            page_uris: List[str] = []
-            for i, page in enumerate(pages, start=1):
-                key = f"{base_prefix}/pages/page_{i:04d}.json"
-                uri = self._s3.put_bytes(key, json.dumps(page, ensure_ascii=False).encode("utf-8"), "application/json")
-                page_uris.append(uri)
+            ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+            # Date-partitioned so listings can StartAfter a day instead of scanning every run
+            base_prefix = f"{self._out}/{ts[:8]}/{ts}/{job_id}"
+            # One object instead of one per page: readers need a single GET, and
+            # Textract JSON is highly repetitive so gzip cuts the bytes ~10x
+            blocks_key = f"{base_prefix}/blocks.ndjson.gz"
+            page_count = 0
+            block_count = 0
+            parts = textract_parser.partition_blocks(())
+            with self._s3.open_write(blocks_key, "application/x-ndjson", content_encoding="gzip") as sink:
+                with gzip.GzipFile(fileobj=sink, mode="wb", compresslevel=6) as out:
+                    for page_count, page in enumerate(pages, start=1):
+                        out.write(json_codec.dumps({"page": page_count, **page}))
+                        out.write(b"\n")
+                        page_blocks = page.get("Blocks") or []
+                        block_count += len(page_blocks)
+                        textract_parser.partition_blocks(page_blocks, parts)
+            blocks_uri = f"s3://{self._s3.bucket}/{blocks_key}"
+            extracted = self._persist_extracted_view(base_prefix, parts, block_count)
 
             manifest = {
                 "job_id": job_id,
                 "source_key": source_key,
-                "pages": page_uris,
+                "blocks": blocks_uri,
+                "page_count": page_count,
+                "extracted": extracted,
                 "created_utc": ts,
             }
-            self._s3.put_json(f"{base_prefix}/index.json", manifest)
+            manifest_key = f"{base_prefix}/index.json"
+            self._s3.put_json(manifest_key, manifest)
+            # Deterministic pointer so readers can find the manifest by source key without listing
+            # (created_utc lets readers reject a pointer left by an earlier upload of the same key)
+            self._s3.put_json(
+                self.pointer_key(source_key),
+                {"source_key": source_key, "manifest_key": manifest_key, "created_utc": ts},
+            )
             logger.info("Persisted results", extra={"stage": "persist", "job_id": job_id, "key": base_prefix, "status": "OK"})
             return manifest
         except Exception as e:  # noqa: BLE001
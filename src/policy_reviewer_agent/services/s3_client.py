@@ -4,24 +4,95 @@ S3 client wrapper: scoped get/put and simple utilities.
 
 from __future__ import annotations
 
-import json
 import logging
-from typing import Any, Dict, Optional
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional
 
-import boto3
+from boto3.session import Session
 from botocore.exceptions import BotoCoreError, ClientError
 
+from .aws_session import BOTO_CONFIG, get_session
+from ..core import json_codec
 from ..core.exceptions import S3ReadError, S3WriteError
 
 logger = logging.getLogger(__name__)
 
+# S3's minimum size for every multipart part except the last.
+MULTIPART_PART_BYTES = 5 * 1024 * 1024
+
+
+@lru_cache(maxsize=None)
+def _get_s3(session: Session):
+    """Process-wide boto3 S3 client per session, reused across warm Lambda invocations."""
+    return session.client("s3", config=BOTO_CONFIG)
+
+
+class _MultipartWriter:
+    """
+    Write-only file object that uploads to S3 in MULTIPART_PART_BYTES parts as data arrives,
+    so at most one part is buffered. Output that never fills a part goes out as a single
+    PutObject instead (one request rather than three).
+    """
+
+    def __init__(self, s3, bucket: str, key: str, extra: Dict[str, str]):
+        self._s3 = s3
+        self._bucket = bucket
+        self._key = key
+        self._extra = extra
+        self._buf = bytearray()
+        self._upload_id: Optional[str] = None
+        self._parts: List[Dict[str, Any]] = []
+
+    def write(self, data: bytes) -> int:
+        self._buf += data
+        if len(self._buf) >= MULTIPART_PART_BYTES:
+            self._upload_part()
+        return len(data)
+
+    def flush(self) -> None:
+        # Parts are sent when full (or on finish); nothing to push early
+        pass
+
+    def _upload_part(self) -> None:
+        if self._upload_id is None:
+            resp = self._s3.create_multipart_upload(Bucket=self._bucket, Key=self._key, **self._extra)
+            self._upload_id = resp["UploadId"]
+        number = len(self._parts) + 1
+        resp = self._s3.upload_part(
+            Bucket=self._bucket, Key=self._key, UploadId=self._upload_id, PartNumber=number, Body=bytes(self._buf)
+        )
+        self._parts.append({"ETag": resp["ETag"], "PartNumber": number})
+        self._buf.clear()
+
+    def finish(self) -> None:
+        if self._upload_id is None:
+            self._s3.put_object(Bucket=self._bucket, Key=self._key, Body=bytes(self._buf), **self._extra)
+            return
+        if self._buf:
+            self._upload_part()
+        self._s3.complete_multipart_upload(
+            Bucket=self._bucket, Key=self._key, UploadId=self._upload_id, MultipartUpload={"Parts": self._parts}
+        )
+
+    def abort(self) -> None:
+        if self._upload_id is None:
+            return
+        try:
+            self._s3.abort_multipart_upload(Bucket=self._bucket, Key=self._key, UploadId=self._upload_id)
+        except (ClientError, BotoCoreError):
+            # A lifecycle rule for incomplete uploads is the backstop; keep the original error
+            logger.warning(
+                "S3 abort_multipart_upload failed", extra={"stage": "s3_put", "key": self._key}, exc_info=True
+            )
+
 
 class S3Client:
     """Thin S3 wrapper for common operations used by the pipeline."""
 
-    def __init__(self, bucket: str):
+    def __init__(self, bucket: str, session: Optional[Session] = None):
         self._bucket = bucket
-        self._s3 = boto3.client("s3")
+        self._s3 = _get_s3(session or get_session())
 
     @property
     def bucket(self) -> str:
@@ -30,7 +101,7 @@ class S3Client:
     def put_json(self, key: str, payload: Dict[str, Any]) -> str:
         """Write JSON to s3://bucket/key; returns s3 URI."""
         try:
-            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            body = json_codec.dumps(payload)
             self._s3.put_object(Bucket=self._bucket, Key=key, Body=body, ContentType="application/json")
             uri = f"s3://{self._bucket}/{key}"
             logger.info("Wrote JSON", extra={"stage": "s3_put", "key": key, "status": "OK"})
@@ -48,12 +119,20 @@ class S3Client:
             logger.error("S3 copy failed", extra={"stage": "s3_copy", "key": dst_key}, exc_info=True)
             raise S3WriteError(str(e)) from e
 
-    def put_bytes(self, key: str, data: bytes, content_type: Optional[str] = None) -> str:
+    def put_bytes(
+        self,
+        key: str,
+        data: bytes,
+        content_type: Optional[str] = None,
+        content_encoding: Optional[str] = None,
+    ) -> str:
         """Write bytes; returns s3 URI."""
         try:
             kwargs: Dict[str, Any] = {"Bucket": self._bucket, "Key": key, "Body": data}
             if content_type:
                 kwargs["ContentType"] = content_type
+            if content_encoding:
+                kwargs["ContentEncoding"] = content_encoding
             self._s3.put_object(**kwargs)
             uri = f"s3://{self._bucket}/{key}"
             logger.info("Wrote bytes", extra={"stage": "s3_put", "key": key, "status": "OK"})
@@ -61,3 +140,33 @@ class S3Client:
         except (ClientError, BotoCoreError) as e:
             logger.error("S3 put_bytes failed", extra={"stage": "s3_put", "key": key}, exc_info=True)
             raise S3WriteError(str(e)) from e
+
+    @contextmanager
+    def open_write(
+        self,
+        key: str,
+        content_type: Optional[str] = None,
+        content_encoding: Optional[str] = None,
+    ) -> Iterator[_MultipartWriter]:
+        """
+        Stream an object to s3://bucket/key: write() to the yielded file object and the data
+        goes up in multipart parts while it is produced. The object appears when the block
+        exits cleanly; on any error the partial upload is aborted.
+        """
+        extra: Dict[str, str] = {}
+        if content_type:
+            extra["ContentType"] = content_type
+        if content_encoding:
+            extra["ContentEncoding"] = content_encoding
+        writer = _MultipartWriter(self._s3, self._bucket, key, extra)
+        try:
+            yield writer
+            writer.finish()
+        except (ClientError, BotoCoreError) as e:
+            writer.abort()
+            logger.error("S3 streamed put failed", extra={"stage": "s3_put", "key": key}, exc_info=True)
+            raise S3WriteError(str(e)) from e
+        except BaseException:
+            writer.abort()
+            raise
+        logger.info("Wrote bytes", extra={"stage": "s3_put", "key": key, "status": "OK"})
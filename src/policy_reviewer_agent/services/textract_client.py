@@ -5,15 +5,32 @@ Amazon Textract client wrapper for async jobs and result pagination.
 from __future__ import annotations
 
 import logging
-from typing import Dict, Iterable, List, Optional, Tuple
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-import boto3
+from boto3.session import Session
 from botocore.exceptions import BotoCoreError, ClientError
 
+from .aws_session import BOTO_CONFIG, get_session
 from ..core.exceptions import TextractJobError
 
 logger = logging.getLogger(__name__)
 
+# Process-wide cap on concurrent Get* calls, matching the default 5 TPS Get* quota.
+_GET_SLOTS = threading.BoundedSemaphore(5)
+# Ceiling for the exponential backoff while a job is still IN_PROGRESS.
+_MAX_POLL_DELAY_S = 5.0
+
+
+@lru_cache(maxsize=None)
+def _get_textract(session: Session, region: str):
+    """Process-wide boto3 Textract client per (session, region), reused across warm invocations."""
+    return session.client("textract", region_name=region, config=BOTO_CONFIG)
+
 
 class TextractClient:
     """
@@ -22,21 +39,30 @@ class TextractClient:
     - get_document_text_detection / get_document_analysis pagination
     """
 
-    def __init__(self, region: str, sns_topic_arn: Optional[str] = None, publish_role_arn: Optional[str] = None):
+    def __init__(
+        self,
+        region: str,
+        sns_topic_arn: Optional[str] = None,
+        publish_role_arn: Optional[str] = None,
+        session: Optional[Session] = None,
+    ):
         self._region = region
         self._sns_topic_arn = sns_topic_arn
         self._publish_role_arn = publish_role_arn
-        self._client = boto3.client("textract", region_name=region)
+        self._client = _get_textract(session or get_session(), region)
 
-    def start_text_detection(self, bucket: str, key: str) -> str:
+    def start_text_detection(self, bucket: str, key: str, client_request_token: Optional[str] = None) -> str:
         """
         Start async text detection and return JobId.
         If SNS is configured, set NotificationChannel so SNS → Lambda callback fires.
+        A repeated `client_request_token` returns the original JobId instead of a new job.
         """
         try:
             kwargs: Dict = {
                 "DocumentLocation": {"S3Object": {"Bucket": bucket, "Name": key}},
             }
+            if client_request_token:
+                kwargs["ClientRequestToken"] = client_request_token
             if self._sns_topic_arn and self._publish_role_arn:
                 kwargs["NotificationChannel"] = {
                     "SNSTopicArn": self._sns_topic_arn,
@@ -50,14 +76,22 @@ class TextractClient:
             logger.error("Textract start failed", extra={"stage": "textract_start", "key": key}, exc_info=True)
             raise TextractJobError(str(e)) from e
 
-    def start_analysis(self, bucket: str, key: str, feature_types: Optional[List[str]] = None) -> str:
-        """Start async document analysis (FORMS/TABLES)."""
+    def start_analysis(
+        self,
+        bucket: str,
+        key: str,
+        feature_types: Optional[List[str]] = None,
+        client_request_token: Optional[str] = None,
+    ) -> str:
+        """Start async document analysis (FORMS/TABLES); see `start_text_detection` for the token."""
         feature_types = feature_types or ["FORMS", "TABLES"]
         try:
             kwargs: Dict = {
                 "DocumentLocation": {"S3Object": {"Bucket": bucket, "Name": key}},
                 "FeatureTypes": feature_types,
             }
+            if client_request_token:
+                kwargs["ClientRequestToken"] = client_request_token
             if self._sns_topic_arn and self._publish_role_arn:
                 kwargs["NotificationChannel"] = {
                     "SNSTopicArn": self._sns_topic_arn,
@@ -71,36 +105,64 @@ class TextractClient:
             logger.error("Textract start failed", extra={"stage": "textract_start", "key": key}, exc_info=True)
             raise TextractJobError(str(e)) from e
 
-    def get_text_results(self, job_id: str) -> Iterable[Dict]:
-        """Yield all pages from GetDocumentTextDetection."""
-        token: Optional[str] = None
-        try:
-            while True:
-                args = {"JobId": job_id}
-                if token:
-                    args["NextToken"] = token
-                resp = self._client.get_document_text_detection(**args)
-                yield resp
-                token = resp.get("NextToken")
-                if not token:
-                    break
-        except (ClientError, BotoCoreError) as e:
-            logger.error("Textract get results failed", extra={"stage": "textract_get", "job_id": job_id}, exc_info=True)
-            raise TextractJobError(str(e)) from e
+    def get_text_results(self, job_id: str, poll_interval: float = 0.5, max_wait_s: float = 60.0) -> Iterable[Dict]:
+        """Yield all pages from GetDocumentTextDetection (waiting while the job is IN_PROGRESS)."""
+        return self._iter_pages("get_document_text_detection", job_id, poll_interval, max_wait_s)
+
+    def get_analysis_results(self, job_id: str, poll_interval: float = 0.5, max_wait_s: float = 60.0) -> Iterable[Dict]:
+        """Yield all pages from GetDocumentAnalysis (waiting while the job is IN_PROGRESS)."""
+        return self._iter_pages("get_document_analysis", job_id, poll_interval, max_wait_s)
+
+    def _iter_pages(self, operation: str, job_id: str, poll_interval: float, max_wait_s: float) -> Iterator[Dict]:
+        """
+        Follow NextToken through a Textract Get* operation, yielding each response.
+        botocore ships no paginator for these operations, so this is the single shared loop.
+
+        The first page is polled with jittered exponential backoff until the job leaves
+        IN_PROGRESS; pagination only starts once it has finished. After that, the next
+        page is requested on a background thread as soon as its NextToken is known, so
+        the HTTP round-trip overlaps with the caller's handling of the current page.
+        """
+        fetch = getattr(self._client, operation)
+
+        def call(**kwargs) -> Dict:
+            with _GET_SLOTS:
+                return fetch(JobId=job_id, **kwargs)
 
-    def get_analysis_results(self, job_id: str) -> Iterable[Dict]:
-        """Yield all pages from GetDocumentAnalysis."""
-        token: Optional[str] = None
         try:
-            while True:
-                args = {"JobId": job_id}
-                if token:
-                    args["NextToken"] = token
-                resp = self._client.get_document_analysis(**args)
-                yield resp
-                token = resp.get("NextToken")
-                if not token:
-                    break
+            resp = self._wait_for_job(call, job_id, poll_interval, max_wait_s)
+            with ThreadPoolExecutor(max_workers=1, thread_name_prefix="textract-get") as pool:
+                while True:
+                    token = resp.get("NextToken")
+                    pending: Optional[Future] = pool.submit(call, NextToken=token) if token else None
+                    yield resp
+                    if pending is None:
+                        break
+                    resp = pending.result()
         except (ClientError, BotoCoreError) as e:
             logger.error("Textract get results failed", extra={"stage": "textract_get", "job_id": job_id}, exc_info=True)
             raise TextractJobError(str(e)) from e
+
+    @staticmethod
+    def _wait_for_job(call, job_id: str, poll_interval: float, max_wait_s: float) -> Dict:
+        """
+        Re-issue the first Get* call until JobStatus is no longer IN_PROGRESS.
+        Returns that first response; raises TextractJobError on FAILED or timeout.
+        """
+        deadline = time.monotonic() + max_wait_s
+        delay = poll_interval
+        while True:
+            resp = call()
+            status = resp.get("JobStatus")
+            if status != "IN_PROGRESS":
+                break
+            if time.monotonic() + delay > deadline:
+                logger.error("Textract job still running", extra={"stage": "textract_get", "job_id": job_id, "status": status})
+                raise TextractJobError(f"Textract job {job_id} still IN_PROGRESS after {max_wait_s}s")
+            time.sleep(delay * random.uniform(0.5, 1.0))
+            delay = min(delay * 2, _MAX_POLL_DELAY_S)
+
+        if status == "FAILED":
+            logger.error("Textract job failed", extra={"stage": "textract_get", "job_id": job_id, "status": status})
+            raise TextractJobError(resp.get("StatusMessage") or f"Textract job {job_id} failed")
+        return resp
@@ -0,0 +1,127 @@
+"""
+Textract block parsing: combined text, key/value pairs and table grids.
+
+Pure-Python (no pandas) so the callback Lambda and the Streamlit UI share one parser.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Only blocks the parsers look up by Id (CHILD text and table cells) are indexed.
+_ID_MAP_TYPES = frozenset(("WORD", "SELECTION_ELEMENT", "CELL"))
+
+
+def partition_blocks(blocks: Iterable[Dict[str, Any]], parts: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    One pass over blocks: index the ones parsers resolve by Id and bucket the rest by
+    BlockType (KEY_VALUE_SET split into KEY / VALUE) so every parser shares the same walk.
+    Pass the `parts` of an earlier call to keep adding to it, e.g. page by page; blocks of
+    other types (PAGE, LAYOUT_*, ...) are not retained.
+    """
+    if parts is None:
+        parts = {
+            "LINE": [],
+            "KEY_VALUE_SET_KEY": [],
+            "KEY_VALUE_SET_VALUE": [],
+            "TABLE": [],
+            "id_map": {},
+        }
+    id_map = parts["id_map"]
+    for b in blocks:
+        bt = b.get("BlockType")
+        if bt in _ID_MAP_TYPES and "Id" in b:
+            id_map[b["Id"]] = b
+        if bt == "KEY_VALUE_SET":
+            entity_types = b.get("EntityTypes") or []
+            if "KEY" in entity_types:
+                parts["KEY_VALUE_SET_KEY"].append(b)
+            if "VALUE" in entity_types:
+                parts["KEY_VALUE_SET_VALUE"].append(b)
+        elif bt in ("LINE", "TABLE"):
+            parts[bt].append(b)
+    return parts
+
+
+def text_from_block(block: Dict[str, Any], id_to_block: Dict[str, Dict[str, Any]]) -> str:
+    """Collect text from a block by walking CHILD relationships to WORD/SELECTION_ELEMENT."""
+    texts: List[str] = []
+    for rel in block.get("Relationships", []) or []:
+        if rel.get("Type") != "CHILD":
+            continue
+        for cid in rel.get("Ids", []):
+            child = id_to_block.get(cid)
+            if not child:
+                continue
+            bt = child.get("BlockType")
+            if bt == "WORD" and child.get("Text"):
+                texts.append(child["Text"])
+            elif bt == "SELECTION_ELEMENT":
+                texts.append("[X]" if child.get("SelectionStatus") == "SELECTED" else "[ ]")
+    return " ".join(texts).strip()
+
+
+def extract_lines(parts: Dict[str, Any]) -> str:
+    """Combined text from LINE blocks (works for both TextDetection and Analysis)."""
+    return "\n".join(b["Text"] for b in parts["LINE"] if b.get("Text"))
+
+
+def parse_kv_pairs(parts: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """Unique (key, value) pairs from KEY_VALUE_SET blocks (Analysis mode), in document order."""
+    id_map = parts["id_map"]
+    value_by_id = {b["Id"]: b for b in parts["KEY_VALUE_SET_VALUE"] if "Id" in b}
+
+    pairs: Dict[Tuple[str, str], None] = {}
+    for k in parts["KEY_VALUE_SET_KEY"]:
+        key_text = text_from_block(k, id_map)
+        val_text = ""
+        for rel in k.get("Relationships", []) or []:
+            if rel.get("Type") == "VALUE":
+                vblock = next((value_by_id[vid] for vid in rel.get("Ids", []) if vid in value_by_id), None)
+                if vblock:
+                    val_text = text_from_block(vblock, id_map)
+        if key_text or val_text:
+            pairs.setdefault((key_text, val_text))
+    return list(pairs)
+
+
+def parse_tables(parts: Dict[str, Any]) -> List[List[List[str]]]:
+    """
+    One row-major grid of cell texts per TABLE block. Cells sharing a spot
+    (merged cells) are joined with " | " in block order.
+    """
+    id_map = parts["id_map"]
+    grids: List[List[List[str]]] = []
+    for tbl in parts["TABLE"]:
+        cells = [
+            id_map[cid]
+            for rel in tbl.get("Relationships", []) or []
+            if rel.get("Type") == "CHILD"
+            for cid in rel.get("Ids", [])
+            if id_map.get(cid) and id_map[cid].get("BlockType") == "CELL"
+        ]
+        if not cells:
+            continue
+
+        n_rows = max(c.get("RowIndex", 1) for c in cells)
+        n_cols = max(c.get("ColumnIndex", 1) for c in cells)
+        grid = [[""] * n_cols for _ in range(n_rows)]
+        for c in cells:
+            txt = text_from_block(c, id_map)
+            if not txt:
+                continue
+            row = grid[c.get("RowIndex", 1) - 1]
+            cidx = c.get("ColumnIndex", 1) - 1
+            row[cidx] = f"{row[cidx]} | {txt}" if row[cidx] else txt
+        grids.append(grid)
+    return grids
+
+
+def split_header(grid: List[List[str]]) -> Tuple[Optional[List[str]], List[List[str]]]:
+    """
+    Promote the first row to a header when the table has more than one row and that row
+    has any text (blank header cells become Col{n}). Returns (header or None, body rows).
+    """
+    if len(grid) > 1 and any(grid[0]):
+        return [c or f"Col{j}" for j, c in enumerate(grid[0], start=1)], grid[1:]
+    return None, grid